@@ -1,22 +1,24 @@
 'use client';
 
 import { useEffect, useState, useCallback } from 'react';
-import { getTopics, type TopicSubmission } from '@/lib/actions/topics';
+import { getWordCloud, type WordCloudData, type WordCloudTerm } from '@/lib/actions/topics';
 
-const PRIORITY_COLORS: Record<string, string> = {
-  high: 'var(--accent-pink)',
-  medium: 'var(--accent-yellow)',
-  low: 'var(--accent-cyan)',
-};
+const TERM_COLORS = [
+  'var(--accent-cyan)',
+  'var(--accent-pink)',
+  'var(--accent-yellow)',
+];
+
+const EMPTY_CLOUD: WordCloudData = { terms: [], total_topics: 0 };
 
 export function TopicWordCloud() {
-  const [topics, setTopics] = useState<TopicSubmission[]>([]);
+  const [cloud, setCloud] = useState<WordCloudData>(EMPTY_CLOUD);
   const [loading, setLoading] = useState(true);
 
   const loadData = useCallback(async () => {
     try {
-      const data = await getTopics();
-      setTopics(data);
+      const data = await getWordCloud();
+      setCloud(data);
     } catch (err) {
       console.error('Failed to load topics:', err);
     } finally {
@@ -56,7 +58,7 @@ export function TopicWordCloud() {
     );
   }
 
-  if (topics.length === 0) {
+  if (cloud.terms.length === 0) {
     return (
       <div 
         className="h-full flex flex-col items-center justify-center p-4 rounded-lg text-center"
@@ -104,84 +106,36 @@ export function TopicWordCloud() {
           className="text-xs"
           style={{ color: 'var(--text-muted)' }}
         >
-          {topics.length} submission{topics.length !== 1 ? 's' : ''}
+          {cloud.total_topics} submission{cloud.total_topics !== 1 ? 's' : ''}
         </p>
       </div>
 
-      {/* Topics list - scrollable */}
+      {/* Weighted terms - scrollable */}
       <div className="flex-1 overflow-y-auto min-h-0">
-        <TopicsListView topics={topics} />
+        <WordCloudView terms={cloud.terms} />
       </div>
     </div>
   );
 }
 
-function TopicsListView({ topics }: { topics: TopicSubmission[] }) {
+function WordCloudView({ terms }: { terms: WordCloudTerm[] }) {
   return (
-    <div className="space-y-2 pr-1">
-      {topics.map((topic) => {
-        const priorityColor = PRIORITY_COLORS[topic.priority] || PRIORITY_COLORS.medium;
-        const date = new Date(topic.created_at);
-        const timeAgo = getTimeAgo(date);
-        
-        return (
-          <div
-            key={topic.id}
-            className="p-2 rounded-md"
-            style={{
-              background: 'rgba(0,0,0,0.2)',
-              borderLeft: `2px solid ${priorityColor}`,
-            }}
-          >
-            <div className="flex items-start justify-between gap-2">
-              <p 
-                className="text-sm font-medium"
-                style={{ color: 'var(--text-primary)' }}
-              >
-                {topic.topic}
-              </p>
-              <span 
-                className="text-xs px-1.5 py-0.5 rounded shrink-0"
-                style={{ 
-                  background: `${priorityColor}30`,
-                  color: priorityColor,
-                }}
-              >
-                {topic.priority}
-              </span>
-            </div>
-            
-            {topic.description && (
-              <p 
-                className="text-xs mt-1 line-clamp-1"
-                style={{ color: 'var(--text-muted)' }}
-              >
-                {topic.description}
-              </p>
-            )}
-            
-            <div 
-              className="flex items-center gap-1 mt-1 text-xs"
-              style={{ color: 'var(--text-muted)' }}
-            >
-              <span>{topic.name || 'Anonymous'}</span>
-              <span>•</span>
-              <span>{timeAgo}</span>
-            </div>
-          </div>
-        );
-      })}
+    <div className="flex flex-wrap items-center justify-center gap-x-3 gap-y-1 px-1">
+      {terms.map((term, i) => (
+        <span
+          key={term.term}
+          className="leading-tight"
+          title={`${term.term} (${term.count} topic${term.count !== 1 ? 's' : ''})`}
+          style={{
+            color: TERM_COLORS[i % TERM_COLORS.length],
+            fontSize: `${0.75 + term.weight * 1.25}rem`,
+            fontWeight: term.weight > 0.5 ? 600 : 400,
+            opacity: 0.6 + term.weight * 0.4,
+          }}
+        >
+          {term.term}
+        </span>
+      ))}
     </div>
   );
 }
-
-function getTimeAgo(date: Date): string {
-  const now = new Date();
-  const seconds = Math.floor((now.getTime() - date.getTime()) / 1000);
-  
-  if (seconds < 60) return 'just now';
-  if (seconds < 3600) return `${Math.floor(seconds / 60)}m ago`;
-  if (seconds < 86400) return `${Math.floor(seconds / 3600)}h ago`;
-  if (seconds < 604800) return `${Math.floor(seconds / 86400)}d ago`;
-  return date.toLocaleDateString();
-}
@@ -18,6 +18,21 @@ export type TopicSubmission = {
   created_at: string;
 };
 
+/**
+ * Precomputed word cloud term from the topic-modeling service.
+ * `weight` is relative (0-1, tags weighted higher); `count` is the number of topics mentioning the term.
+ */
+export type WordCloudTerm = {
+  term: string;
+  weight: number;
+  count: number;
+};
+
+export type WordCloudData = {
+  terms: WordCloudTerm[];
+  total_topics: number;
+};
+
 export type SubmitResult = {
   success?: boolean;
   error?: string;
@@ -32,6 +47,26 @@ const TopicSchema = z.object({
   priority: z.enum(['low', 'medium', 'high']).default('medium'),
 });
 
+/**
+ * Call the topic-modeling service. Returns null when the service is not configured.
+ */
+async function topicModelingFetch(path: string, init: RequestInit = {}): Promise<Response | null> {
+  const baseUrl = process.env.TOPIC_MODELING_URL;
+  if (!baseUrl) return null;
+
+  const apiKey = process.env.TOPIC_MODELING_API_KEY;
+  return fetch(`${baseUrl}${path}`, {
+    ...init,
+    headers: {
+      'Content-Type': 'application/json',
+      ...(apiKey ? { 'X-API-Key': apiKey } : {}),
+      ...init.headers,
+    },
+    cache: 'no-store',
+    signal: AbortSignal.timeout(5000),
+  });
+}
+
 /**
  * Constant-time string comparison to prevent timing attacks.
  */
@@ -83,7 +118,7 @@ export async function submitTopic(formData: FormData): Promise<SubmitResult> {
         description: parsed.data.description,
         priority: parsed.data.priority,
       })
-      .select('id')
+      .select('id, created_at')
       .single();
 
     if (error) throw error;
@@ -93,6 +128,21 @@ export async function submitTopic(formData: FormData): Promise<SubmitResult> {
       console.error('Discord notification failed:', err)
     );
 
+    // Update the word cloud term index (fire and forget)
+    if (data?.id) {
+      topicModelingFetch('/wordcloud/ingest', {
+        method: 'POST',
+        body: JSON.stringify({
+          topics: [{
+            id: data.id,
+            topic: parsed.data.topic,
+            description: parsed.data.description,
+            created_at: data.created_at,
+          }],
+        }),
+      }).catch(err => console.error('Word cloud indexing failed:', err));
+    }
+
     revalidatePath('/topics');
     return { success: true, topicId: data?.id };
   } catch (error) {
@@ -196,6 +246,39 @@ export async function getTopicWords(): Promise<{ word: string; count: number }[]
   }
 }
 
+/**
+ * Get precomputed word cloud weights from the topic-modeling service.
+ * Falls back to counting words from the database when the service is unavailable
+ * or its index is empty (e.g. not yet backfilled, or restarted without a snapshot).
+ */
+export async function getWordCloud(limit = 50): Promise<WordCloudData> {
+  try {
+    const response = await topicModelingFetch(`/wordcloud?limit=${limit}`);
+    if (response?.ok) {
+      const cloud: WordCloudData = await response.json();
+      if (cloud.total_topics > 0) return cloud;
+    }
+  } catch (error) {
+    console.error('Failed to fetch word cloud:', error);
+  }
+
+  try {
+    const supabase = getSupabase();
+    const [words, { count }] = await Promise.all([
+      getTopicWords(),
+      supabase.from('topic_requests').select('*', { count: 'exact', head: true }),
+    ]);
+    const peak = words[0]?.count || 1;
+    return {
+      terms: words.slice(0, limit).map(({ word, count }) => ({ term: word, weight: count / peak, count })),
+      total_topics: count || 0,
+    };
+  } catch (error) {
+    console.error('Failed to build word cloud:', error);
+    return { terms: [], total_topics: 0 };
+  }
+}
+
 export async function clearAllTopics(): Promise<{ success: boolean; deleted: number; error?: string }> {
   // Authentication check - require admin key with timing-safe comparison
   const headersList = await headers();
@@ -224,6 +307,10 @@ export async function clearAllTopics(): Promise<{ success: boolean; deleted: num
 
     if (error) throw error;
 
+    topicModelingFetch('/wordcloud', { method: 'DELETE' }).catch(err =>
+      console.error('Word cloud reset failed:', err)
+    );
+
     revalidatePath('/topics');
     return { success: true, deleted: count || 0 };
   } catch (error) {
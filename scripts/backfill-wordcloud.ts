@@ -0,0 +1,66 @@
+#!/usr/bin/env node
+/**
+ * Backfill the topic-modeling word cloud index from Supabase.
+ * Safe to re-run: topics are upserted by id.
+ * Run with: npx tsx scripts/backfill-wordcloud.ts
+ */
+
+import { createClient } from '@supabase/supabase-js';
+import * as dotenv from 'dotenv';
+
+// Load env vars
+dotenv.config({ path: '.env.local' });
+
+const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL;
+const supabaseKey = process.env.SUPABASE_SERVICE_ROLE_KEY;
+const topicModelingUrl = process.env.TOPIC_MODELING_URL || 'http://localhost:8000';
+const apiKey = process.env.TOPIC_MODELING_API_KEY;
+
+if (!supabaseUrl || !supabaseKey) {
+  console.error('❌ Missing Supabase credentials');
+  console.error('   Set NEXT_PUBLIC_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY in .env.local');
+  process.exit(1);
+}
+
+const supabase = createClient(supabaseUrl, supabaseKey);
+const BATCH_SIZE = 500;
+
+async function main() {
+  let indexed = 0;
+
+  for (let from = 0; ; from += BATCH_SIZE) {
+    const { data, error } = await supabase
+      .from('topic_requests')
+      .select('id, topic, description, created_at')
+      .order('id', { ascending: true })
+      .range(from, from + BATCH_SIZE - 1);
+
+    if (error) {
+      console.error('❌ Failed to fetch topics:', error.message);
+      process.exit(1);
+    }
+    if (!data || data.length === 0) break;
+
+    const response = await fetch(`${topicModelingUrl}/wordcloud/ingest`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        ...(apiKey ? { 'X-API-Key': apiKey } : {}),
+      },
+      body: JSON.stringify({ topics: data }),
+    });
+
+    if (!response.ok) {
+      console.error(`❌ Ingest failed with status ${response.status}`);
+      process.exit(1);
+    }
+
+    indexed += data.length;
+    console.warn(`📊 Indexed ${indexed} topics...`);
+    if (data.length < BATCH_SIZE) break;
+  }
+
+  console.warn(`✅ Word cloud index backfilled with ${indexed} topics`);
+}
+
+main().catch(console.error);
@@ -0,0 +1,160 @@
+"""
+Conditional GET and compact serialization for large analysis responses.
+
+Each response gets a weak ETag derived from the request input plus the model
+settings that produced it, so identical requests can be answered with a 304
+(or with the cached body) without re-running the LLM. A 304 is only sent for
+results this server has served and still caches. Bodies are encoded once
+with orjson and compressed once per negotiated encoding (br or gzip).
+"""
+
+import gzip
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import brotli
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+
+MIN_COMPRESS_BYTES = 1024
+
+
+def _parse_accept_encoding(header: str) -> dict[str, float]:
+    """Map each encoding in an Accept-Encoding header to its q-value."""
+    encodings = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        encodings[name.strip().lower()] = q
+    return encodings
+
+
+def negotiate_encoding(request: Request) -> Optional[str]:
+    """Pick the acceptable encoding with the highest q-value; br wins ties with gzip."""
+    accepted = _parse_accept_encoding(request.headers.get("accept-encoding", ""))
+    best, best_q = None, 0.0
+    for encoding in ("br", "gzip"):
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Weak comparison of If-None-Match against our ETag.
+
+    `*` is deliberately not honored: these are POST endpoints, and a wildcard
+    would 304 inputs the server has never computed.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+class _CachedBody:
+    """Serialized JSON plus lazily computed compressed variants."""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.created = time.monotonic()
+        self.encoded: dict[str, bytes] = {}
+
+    def get(self, encoding: Optional[str]) -> bytes:
+        if encoding is None or len(self.body) < MIN_COMPRESS_BYTES:
+            return self.body
+        if encoding not in self.encoded:
+            if encoding == "br":
+                self.encoded[encoding] = brotli.compress(self.body, quality=5)
+            else:
+                self.encoded[encoding] = gzip.compress(self.body, compresslevel=6)
+        return self.encoded[encoding]
+
+
+class ResponseCache:
+    """Thread-safe LRU of serialized responses keyed by ETag."""
+
+    def __init__(self, settings: dict, max_entries: int = 128, ttl_seconds: float = 3600.0):
+        """
+        Args:
+            settings: Model/service settings that change results; folded into every ETag
+            max_entries: Maximum cached response bodies
+            ttl_seconds: How long a cached body may be reused without regenerating
+        """
+        self.settings = settings
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _CachedBody] = OrderedDict()
+
+    def etag(self, endpoint: str, payload) -> str:
+        """Stable content hash of endpoint + input + settings."""
+        canonical = orjson.dumps(
+            {"endpoint": endpoint, "input": jsonable_encoder(payload), "settings": self.settings},
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        )
+        return f'W/"{hashlib.sha256(canonical).hexdigest()[:32]}"'
+
+    def lookup(self, request: Request, etag: str, cache_control: str) -> Optional[Response]:
+        """
+        Return a 304 if the client already has a result we served and still hold,
+        the cached body otherwise, or None if the result must be generated.
+        """
+        with self._lock:
+            cached = self._entries.get(etag)
+            if cached is not None and time.monotonic() - cached.created > self.ttl_seconds:
+                del self._entries[etag]
+                cached = None
+            if cached is not None:
+                self._entries.move_to_end(etag)
+        if cached is None:
+            return None
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=self._headers(etag, cache_control))
+        return self._respond(request, etag, cached, cache_control)
+
+    def store(self, request: Request, etag: str, content, cache_control: str, cacheable: bool = True) -> Response:
+        """
+        Serialize content once, cache it under its ETag, and return the response.
+
+        With `cacheable=False` (e.g. a degraded result) the body is served with
+        `Cache-Control: no-store` and not kept, so the next request regenerates it.
+        """
+        cached = _CachedBody(
+            orjson.dumps(content, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS)
+        )
+        if not cacheable:
+            return self._respond(request, etag, cached, "no-store")
+        with self._lock:
+            self._entries[etag] = cached
+            self._entries.move_to_end(etag)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return self._respond(request, etag, cached, cache_control)
+
+    @staticmethod
+    def _headers(etag: str, cache_control: str) -> dict[str, str]:
+        return {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+
+    def _respond(self, request: Request, etag: str, cached: _CachedBody, cache_control: str) -> Response:
+        encoding = negotiate_encoding(request)
+        body = cached.get(encoding)
+        headers = self._headers(etag, cache_control)
+        if body is not cached.body:
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
@@ -9,11 +9,13 @@ FastAPI runs sync endpoints in a thread pool automatically.
 import hmac
 import os
 import logging
+from dataclasses import asdict
+from datetime import datetime, timezone
 from typing import Optional
 
 import httpx
 import dspy
-from fastapi import FastAPI, HTTPException, Depends, Security
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Security
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import APIKeyHeader
 from pydantic import BaseModel, Field
@@ -27,6 +29,9 @@ from topic_modeler import (
     TopicAnalyzer,
     AgendaGenerator,
 )
+from priority_scorer import ScoringWeights
+from term_index import TermFrequencyIndex
+from http_cache import ResponseCache
 
 
 # ============================================
@@ -37,6 +42,36 @@ OLLAMA_URL = os.getenv("OLLAMA_URL", "http://ollama:11434")
 MODEL = os.getenv("OLLAMA_MODEL", "llama3.2")
 TEMPERATURE = float(os.getenv("OLLAMA_TEMPERATURE", "0.7"))
 
+# Prioritization: 'local' (no LLM), 'hybrid' (LLM reasoning for top-K only), 'llm' (legacy)
+PRIORITIZATION_MODE = os.getenv("PRIORITIZATION_MODE", "hybrid")
+if PRIORITIZATION_MODE not in ("local", "hybrid", "llm"):
+    raise ValueError(f"Invalid PRIORITIZATION_MODE: {PRIORITIZATION_MODE!r}")
+PRIORITY_REASONING_TOP_K = int(os.getenv("PRIORITY_REASONING_TOP_K", "10"))
+PRIORITY_WEIGHTS = ScoringWeights.from_env()
+
+# Word cloud term index: optional JSON snapshot + change log so counts survive restarts
+WORDCLOUD_INDEX_PATH = os.getenv("WORDCLOUD_INDEX_PATH", "")
+TERM_INDEX = TermFrequencyIndex(WORDCLOUD_INDEX_PATH or None)
+
+# Response caching: ETags derive from request input + these settings
+CACHE_CONTROL = {
+    "analyze": os.getenv("CACHE_CONTROL_ANALYZE", "private, max-age=300, must-revalidate"),
+    "themes": os.getenv("CACHE_CONTROL_THEMES", "private, max-age=300, must-revalidate"),
+    "agenda": os.getenv("CACHE_CONTROL_AGENDA", "private, max-age=300, must-revalidate"),
+}
+RESPONSE_CACHE = ResponseCache(
+    settings={
+        "version": "1.0.0",
+        "model": MODEL,
+        "temperature": TEMPERATURE,
+        "prioritization_mode": PRIORITIZATION_MODE,
+        "reasoning_top_k": PRIORITY_REASONING_TOP_K,
+        "weights": asdict(PRIORITY_WEIGHTS),
+    },
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "128")),
+    ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600")),
+)
+
 # CORS: Production - Set ALLOWED_ORIGINS=https://your-domain.vercel.app
 ALLOWED_ORIGINS = os.getenv(
     "ALLOWED_ORIGINS",
@@ -63,15 +98,24 @@ LM = dspy.LM(f"ollama_chat/{MODEL}", api_base=OLLAMA_URL, temperature=TEMPERATUR
 # ============================================
 
 class TopicInput(BaseModel):
+    id: Optional[int] = None
     topic: str
     description: Optional[str] = ""
     priority: Optional[str] = "medium"
+    submission_count: Optional[int] = Field(default=None, ge=1)
+    created_at: Optional[str] = None
+    cluster_size: Optional[int] = Field(default=None, ge=1)
 
 
 class TopicsAnalysisRequest(BaseModel):
     topics: list[TopicInput]
 
 
+class PrioritizeRequest(BaseModel):
+    topics: list[TopicInput]
+    top_k: int = Field(default=PRIORITY_REASONING_TOP_K, ge=0, le=100)
+
+
 class ThemeExtractionRequest(BaseModel):
     topics: list[str]
 
@@ -79,6 +123,20 @@ class ThemeExtractionRequest(BaseModel):
 class SummarizeRequest(BaseModel):
     topic: str
     description: Optional[str] = ""
+    id: Optional[int] = None
+    created_at: Optional[str] = None
+
+
+class WordCloudDocument(BaseModel):
+    id: int
+    topic: str
+    description: Optional[str] = None
+    tags: Optional[list[str]] = None
+    created_at: Optional[str] = None
+
+
+class WordCloudIngestRequest(BaseModel):
+    topics: list[WordCloudDocument]
 
 
 class AgendaRequest(BaseModel):
@@ -110,6 +168,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 
@@ -137,7 +196,7 @@ def health_check():
 
 
 @app.post("/analyze", dependencies=[Depends(verify_api_key)])
-def analyze_topics(request: TopicsAnalysisRequest):
+def analyze_topics(request: TopicsAnalysisRequest, http_request: Request):
     """
     Full topic analysis: themes, summaries, and prioritization.
     This is the comprehensive endpoint for deep analysis.
@@ -145,19 +204,77 @@ def analyze_topics(request: TopicsAnalysisRequest):
     if not request.topics:
         raise HTTPException(status_code=400, detail="No topics provided")
     
+    # Local prioritization depends on "now" via recency; bucket it by UTC day
+    etag = RESPONSE_CACHE.etag(
+        "analyze",
+        {"request": request.model_dump(), "day": datetime.now(timezone.utc).date().isoformat()},
+    )
+    cached = RESPONSE_CACHE.lookup(http_request, etag, CACHE_CONTROL["analyze"])
+    if cached is not None:
+        return cached
+    
     try:
         with dspy.context(lm=LM):
-            analyzer = TopicAnalyzer()
+            analyzer = TopicAnalyzer(
+                weights=PRIORITY_WEIGHTS,
+                reasoning_top_k=PRIORITY_REASONING_TOP_K,
+                prioritization_mode=PRIORITIZATION_MODE,
+            )
             topics_data = [t.model_dump() for t in request.topics]
             result = analyzer.analyze_topics(topics_data)
-            return result
+            # Indexing is a side effect; never fail a finished analysis over it
+            try:
+                TERM_INDEX.upsert_many([
+                    {
+                        "id": t.id,
+                        "topic": t.topic,
+                        "description": t.description,
+                        "tags": s["tags"],
+                        "created_at": t.created_at,
+                    }
+                    for t, s in zip(request.topics, result["summaries"])
+                    if t.id is not None
+                ])
+            except Exception:
+                logger.exception("Word cloud indexing failed")
+            # Don't cache a result whose top-K reasoning fell back to None
+            degraded = PRIORITIZATION_MODE == "hybrid" and any(
+                item.get("reasoning") is None
+                for item in result["prioritization"][:PRIORITY_REASONING_TOP_K]
+            )
+            return RESPONSE_CACHE.store(
+                http_request, etag, result, CACHE_CONTROL["analyze"], cacheable=not degraded
+            )
     except Exception as e:
         logger.exception("Analysis failed")
         raise HTTPException(status_code=500, detail="Analysis failed. Please try again later.")
 
 
+@app.post("/prioritize", dependencies=[Depends(verify_api_key)])
+def prioritize_topics(request: PrioritizeRequest):
+    """
+    Rank topics with the local scorer.
+    Only the top_k topics are sent to the LLM for reasoning (none in 'local' mode).
+    """
+    if not request.topics:
+        raise HTTPException(status_code=400, detail="No topics provided")
+    
+    try:
+        with dspy.context(lm=LM):
+            analyzer = TopicAnalyzer(
+                weights=PRIORITY_WEIGHTS,
+                reasoning_top_k=request.top_k,
+                prioritization_mode=PRIORITIZATION_MODE,
+            )
+            topics_data = [t.model_dump() for t in request.topics]
+            return {"prioritization": analyzer.prioritize_topics(topics_data)}
+    except Exception as e:
+        logger.exception("Prioritization failed")
+        raise HTTPException(status_code=500, detail="Prioritization failed. Please try again later.")
+
+
 @app.post("/themes", dependencies=[Depends(verify_api_key)])
-def extract_themes(request: ThemeExtractionRequest):
+def extract_themes(request: ThemeExtractionRequest, http_request: Request):
     """
     Quick theme extraction from topic strings.
     Lighter weight than full analysis.
@@ -165,11 +282,18 @@ def extract_themes(request: ThemeExtractionRequest):
     if not request.topics:
         raise HTTPException(status_code=400, detail="No topics provided")
     
+    etag = RESPONSE_CACHE.etag("themes", request.model_dump())
+    cached = RESPONSE_CACHE.lookup(http_request, etag, CACHE_CONTROL["themes"])
+    if cached is not None:
+        return cached
+    
     try:
         with dspy.context(lm=LM):
             extractor = dspy.ChainOfThought(ExtractThemes)
             result = extractor(topics=request.topics)
-            return {"themes": result.themes}
+            return RESPONSE_CACHE.store(
+                http_request, etag, {"themes": result.themes}, CACHE_CONTROL["themes"]
+            )
     except Exception as e:
         logger.exception("Theme extraction failed")
         raise HTTPException(status_code=500, detail="Theme extraction failed. Please try again later.")
@@ -187,6 +311,18 @@ def summarize_topic(request: SummarizeRequest):
         with dspy.context(lm=LM):
             summarizer = dspy.ChainOfThought(SummarizeTopic)
             result = summarizer(topic=request.topic, description=request.description or "")
+            if request.id is not None:
+                # Indexing is a side effect; never fail a finished summary over it
+                try:
+                    TERM_INDEX.upsert(
+                        request.id,
+                        request.topic,
+                        result.tags,
+                        request.created_at,
+                        description=request.description,
+                    )
+                except Exception:
+                    logger.exception("Word cloud indexing failed")
             return {
                 "summary": result.summary,
                 "tags": result.tags
@@ -197,13 +333,18 @@ def summarize_topic(request: SummarizeRequest):
 
 
 @app.post("/agenda", dependencies=[Depends(verify_api_key)])
-def generate_agenda(request: AgendaRequest):
+def generate_agenda(request: AgendaRequest, http_request: Request):
     """
     Generate a meeting agenda from topics.
     """
     if not request.topics:
         raise HTTPException(status_code=400, detail="No topics provided")
     
+    etag = RESPONSE_CACHE.etag("agenda", request.model_dump())
+    cached = RESPONSE_CACHE.lookup(http_request, etag, CACHE_CONTROL["agenda"])
+    if cached is not None:
+        return cached
+    
     try:
         with dspy.context(lm=LM):
             generator = AgendaGenerator()
@@ -211,12 +352,50 @@ def generate_agenda(request: AgendaRequest):
                 topics=request.topics,
                 duration_minutes=request.duration_minutes,
             )
-            return {"agenda": agenda, "duration_minutes": request.duration_minutes}
+            return RESPONSE_CACHE.store(
+                http_request,
+                etag,
+                {"agenda": agenda, "duration_minutes": request.duration_minutes},
+                CACHE_CONTROL["agenda"],
+            )
     except Exception as e:
         logger.exception("Agenda generation failed")
         raise HTTPException(status_code=500, detail="Agenda generation failed. Please try again later.")
 
 
+@app.get("/wordcloud", dependencies=[Depends(verify_api_key)])
+def get_wordcloud(
+    limit: int = Query(default=50, ge=1, le=200),
+    window_days: Optional[int] = Query(default=None, ge=1, le=365),
+):
+    """
+    Top-N weighted terms from the incrementally maintained term/tag index.
+    """
+    return TERM_INDEX.top(limit=limit, window_days=window_days)
+
+
+@app.post("/wordcloud/ingest", dependencies=[Depends(verify_api_key)])
+def ingest_wordcloud(request: WordCloudIngestRequest):
+    """
+    Add or update topics in the term index (idempotent per topic id).
+    """
+    try:
+        TERM_INDEX.upsert_many([t.model_dump() for t in request.topics])
+        return {"indexed": len(request.topics), "total_topics": len(TERM_INDEX)}
+    except Exception as e:
+        logger.exception("Word cloud ingest failed")
+        raise HTTPException(status_code=500, detail="Word cloud ingest failed. Please try again later.")
+
+
+@app.delete("/wordcloud", dependencies=[Depends(verify_api_key)])
+def clear_wordcloud():
+    """
+    Remove every topic from the term index.
+    """
+    TERM_INDEX.clear()
+    return {"total_topics": 0}
+
+
 @app.get("/")
 def root():
     """Service info."""
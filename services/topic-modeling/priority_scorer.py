@@ -0,0 +1,213 @@
+"""
+Local, deterministic topic prioritization.
+
+Scores are computed in NumPy from the submitted priority level, submission
+counts, recency of `created_at`, and theme cluster size. The LLM is only
+asked to explain the top-K results (see `TopicAnalyzer`), so ranking cost
+no longer grows with the number of topics sent to Ollama.
+"""
+
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+import numpy as np
+
+
+PRIORITY_LEVELS = {"low": 0.0, "medium": 0.5, "high": 1.0}
+
+
+@dataclass(frozen=True)
+class ScoringWeights:
+    """Relative weight of each signal. Weights are normalized when scoring."""
+
+    priority: float = 0.4
+    submissions: float = 0.3
+    recency: float = 0.2
+    cluster: float = 0.1
+    recency_half_life_days: float = 14.0
+
+    def __post_init__(self):
+        for name in ("priority", "submissions", "recency", "cluster"):
+            value = getattr(self, name)
+            if not math.isfinite(value) or value < 0:
+                raise ValueError(f"Invalid priority weight {name}={value!r}: must be finite and >= 0")
+        if not math.isfinite(self.recency_half_life_days) or self.recency_half_life_days <= 0:
+            raise ValueError(
+                f"Invalid recency_half_life_days={self.recency_half_life_days!r}: must be finite and > 0"
+            )
+
+    @classmethod
+    def from_env(cls) -> "ScoringWeights":
+        """Read weights from PRIORITY_WEIGHT_* env vars, falling back to defaults."""
+        defaults = cls()
+        return cls(
+            priority=float(os.getenv("PRIORITY_WEIGHT_PRIORITY", defaults.priority)),
+            submissions=float(os.getenv("PRIORITY_WEIGHT_SUBMISSIONS", defaults.submissions)),
+            recency=float(os.getenv("PRIORITY_WEIGHT_RECENCY", defaults.recency)),
+            cluster=float(os.getenv("PRIORITY_WEIGHT_CLUSTER", defaults.cluster)),
+            recency_half_life_days=float(
+                os.getenv("PRIORITY_RECENCY_HALF_LIFE_DAYS", defaults.recency_half_life_days)
+            ),
+        )
+
+    def as_array(self) -> np.ndarray:
+        return np.array([self.priority, self.submissions, self.recency, self.cluster], dtype=np.float64)
+
+
+def _parse_timestamp(value) -> float:
+    """Parse an ISO-8601 timestamp to epoch seconds, or NaN if missing/invalid."""
+    if not value:
+        return math.nan
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        try:
+            dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return math.nan
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_topic_text(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace so duplicates compare equal."""
+    return _NON_WORD_RE.sub(" ", str(text or "").lower()).strip()
+
+
+def submission_counts(topics: list[dict]) -> np.ndarray:
+    """
+    Submission count per topic.
+
+    A client-supplied 'submission_count' wins; otherwise each topic counts how
+    many topics in the batch share its normalized text.
+    """
+    keys = [normalize_topic_text(t.get("topic") or t.get("text")) for t in topics]
+    duplicates = Counter(keys)
+    return np.fromiter(
+        (t.get("submission_count") or duplicates[key] for t, key in zip(topics, keys)),
+        dtype=np.float64,
+        count=len(topics),
+    )
+
+
+def _log_scale(values: np.ndarray) -> np.ndarray:
+    """Map counts >= 1 onto [0, 1] with diminishing returns; a count of 1 scores 0."""
+    scaled = np.log1p(np.maximum(values - 1.0, 0.0))
+    peak = scaled.max(initial=0.0)
+    return scaled / peak if peak > 0 else np.zeros_like(scaled)
+
+
+def cluster_sizes_from_themes(themes, n_topics: int) -> np.ndarray:
+    """
+    Size of the largest theme each topic belongs to, from ExtractThemes output.
+
+    Topics not referenced by any theme (or malformed LLM output) get size 1.
+    """
+    sizes = np.ones(n_topics, dtype=np.float64)
+    for theme in themes or []:
+        if not isinstance(theme, dict):
+            continue
+        related = theme.get("related_topics") or []
+        if not isinstance(related, list):
+            continue
+        parsed = []
+        for i in related:
+            # LLMs often return indices as strings ("2"); repeats are collapsed below
+            try:
+                i = int(i)
+            except (TypeError, ValueError):
+                continue
+            if 0 <= i < n_topics:
+                parsed.append(i)
+        indices = np.unique(np.array(parsed, dtype=np.intp))
+        if indices.size:
+            sizes[indices] = np.maximum(sizes[indices], indices.size)
+    return sizes
+
+
+def score_topics(
+    topics: list[dict],
+    weights: Optional[ScoringWeights] = None,
+    cluster_sizes: Optional[np.ndarray] = None,
+    now: Optional[datetime] = None,
+) -> np.ndarray:
+    """
+    Compute a score in [0, 1] for each topic.
+
+    Args:
+        topics: Dicts with 'topic' and 'priority', and optionally
+            'submission_count', 'created_at' and 'cluster_size'
+        weights: Signal weights (defaults to `ScoringWeights()`)
+        cluster_sizes: Per-topic cluster sizes (e.g. from themes); the larger of
+            this and any 'cluster_size' key is used
+        now: Reference time for recency (defaults to current UTC time)
+
+    Returns:
+        Array of scores aligned with `topics`
+    """
+    weights = weights or ScoringWeights()
+    n = len(topics)
+    if n == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    priority = np.fromiter(
+        (PRIORITY_LEVELS.get(str(t.get("priority") or "medium").lower(), 0.5) for t in topics),
+        dtype=np.float64,
+        count=n,
+    )
+    submissions = submission_counts(topics)
+    created = np.fromiter(
+        (_parse_timestamp(t.get("created_at")) for t in topics), dtype=np.float64, count=n
+    )
+    supplied_clusters = np.fromiter(
+        (t.get("cluster_size") or 1 for t in topics), dtype=np.float64, count=n
+    )
+    if cluster_sizes is None:
+        cluster_sizes = supplied_clusters
+    else:
+        cluster_sizes = np.maximum(np.asarray(cluster_sizes, dtype=np.float64), supplied_clusters)
+
+    reference = (now or datetime.now(timezone.utc)).timestamp()
+    age_days = np.maximum(reference - created, 0.0) / 86400.0
+    half_life = weights.recency_half_life_days
+    # Topics without a timestamp get no recency boost
+    recency = np.nan_to_num(np.exp2(-age_days / half_life), nan=0.0)
+
+    signals = np.stack(
+        [priority, _log_scale(submissions), recency, _log_scale(cluster_sizes)],
+        axis=1,
+    )
+    w = weights.as_array()
+    total = w.sum()
+    if total == 0:
+        return np.zeros(n, dtype=np.float64)
+    return signals @ (w / total)
+
+
+def rank_topics(
+    topics: list[dict],
+    weights: Optional[ScoringWeights] = None,
+    cluster_sizes: Optional[np.ndarray] = None,
+    now: Optional[datetime] = None,
+) -> list[dict]:
+    """
+    Rank topics by local score, highest first. Ties keep submission order.
+
+    Returns:
+        List of dicts with 'topic_index' and 'score'
+    """
+    scores = score_topics(topics, weights=weights, cluster_sizes=cluster_sizes, now=now)
+    order = np.argsort(-scores, kind="stable")
+    return [
+        {"topic_index": int(i), "score": round(float(scores[i]), 4)}
+        for i in order
+    ]
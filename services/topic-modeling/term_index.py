@@ -0,0 +1,389 @@
+"""
+Incrementally updated term/tag frequency index for the topic word cloud.
+
+Topic text is normalized (lowercased, stopwords removed, inflections stemmed) and
+counted per day, alongside tags produced by SummarizeTopic. Documents are
+upserted by topic id so re-ingesting the same topic never double counts.
+The top-N weighted terms are cached until the index changes, so the
+`/wordcloud` endpoint serves a few KB of precomputed weights.
+
+When a path is configured, each change is appended to `<path>.log` and the
+log is periodically compacted into the `<path>` snapshot, so a submission
+costs one small append rather than a rewrite of the whole corpus.
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Optional
+
+
+STOPWORDS = frozenset("""
+    a an the and or but in on at to for of with by is it that this as be are was were
+    been have has had do does did will would could should may might must can i you we
+    they he she my your our their what how when where why which who about from into
+    using use vs get want learn more some any just like also
+""".split())
+
+TAG_WEIGHT = 2.0
+COMPACT_EVERY = 1000
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]")
+_VOWELS = frozenset("aeiou")
+
+
+def _is_consonant(word: str, i: int) -> bool:
+    if word[i] in _VOWELS:
+        return False
+    if word[i] == "y":
+        return i == 0 or not _is_consonant(word, i - 1)
+    return True
+
+
+def _measure(stem_: str) -> int:
+    """Porter's m: number of vowel-consonant sequences in the stem."""
+    m, prev_vowel = 0, False
+    for i in range(len(stem_)):
+        consonant = _is_consonant(stem_, i)
+        if consonant and prev_vowel:
+            m += 1
+        prev_vowel = not consonant
+    return m
+
+
+def _has_vowel(stem_: str) -> bool:
+    return any(not _is_consonant(stem_, i) for i in range(len(stem_)))
+
+
+def _ends_cvc(stem_: str) -> bool:
+    """Consonant-vowel-consonant ending, where the last consonant is not w, x or y."""
+    return (
+        len(stem_) >= 3
+        and _is_consonant(stem_, len(stem_) - 3)
+        and not _is_consonant(stem_, len(stem_) - 2)
+        and _is_consonant(stem_, len(stem_) - 1)
+        and stem_[-1] not in "wxy"
+    )
+
+
+def stem(word: str) -> str:
+    """
+    Strip inflections only (Porter steps 1a/1b), so plurals and -ing/-ed forms
+    merge without conflating related-but-different words.
+
+    >>> [stem(w) for w in ("engineer", "engineers", "engineering", "engine")]
+    ['engineer', 'engineer', 'engineer', 'engine']
+    >>> [stem(w) for w in ("code", "coding", "coded", "coder")]
+    ['code', 'code', 'code', 'coder']
+    >>> [stem(w) for w in ("business", "classes", "class", "server", "servers")]
+    ['business', 'class', 'class', 'server', 'server']
+    >>> [stem(w) for w in ("agents", "prompting", "running", "caches", "libraries", "deployed", "status")]
+    ['agent', 'prompt', 'run', 'cache', 'library', 'deploy', 'status']
+    >>> [stem(w) for w in ("boxes", "branches", "patches", "pushes")]
+    ['box', 'branch', 'patch', 'push']
+    """
+    if len(word) <= 3 or not word.isalpha():
+        return word
+
+    # Step 1a: plurals
+    if word.endswith("sses"):
+        word = word[:-2]
+    elif word.endswith("ies"):
+        word = word[:-3] + "y"
+    elif word.endswith(("xes", "shes")) or (
+        word.endswith("ches") and len(word) > 5 and _is_consonant(word, len(word) - 5)
+    ):
+        # boxes, pushes, branches; but caches -> cache via the plain -s rule
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+
+    # Step 1b: -eed, -ed, -ing
+    if word.endswith("eed"):
+        if _measure(word[:-3]) > 0:
+            word = word[:-1]
+        return word
+    for suffix in ("ed", "ing"):
+        base = word[: -len(suffix)]
+        if word.endswith(suffix) and _has_vowel(base):
+            if base.endswith(("at", "bl", "iz")):
+                return base + "e"
+            if len(base) > 1 and base[-1] == base[-2] and base[-1] not in "lsz":
+                return base[:-1]
+            if _measure(base) == 1 and _ends_cvc(base):
+                return base + "e"
+            return base
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase and split text into candidate terms, dropping stopwords."""
+    return [
+        token for token in _TOKEN_RE.findall((text or "").lower())
+        if len(token) > 2 and token not in STOPWORDS
+    ]
+
+
+def normalize_tag(tag: str) -> str:
+    """Tags are kept as phrases, but whitespace and case are normalized."""
+    return " ".join(str(tag).lower().replace("#", " ").split())
+
+
+def _day(created_at) -> int:
+    """Day bucket (days since epoch) for a timestamp; defaults to today."""
+    if isinstance(created_at, datetime):
+        dt = created_at
+    else:
+        try:
+            dt = datetime.fromisoformat(str(created_at).replace("Z", "+00:00"))
+        except (TypeError, ValueError):
+            dt = datetime.now(timezone.utc)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() // 86400)
+
+
+class TermFrequencyIndex:
+    """Thread-safe per-day frequency index over topic terms and tags."""
+
+    def __init__(self, path: Optional[str] = None, compact_every: int = COMPACT_EVERY):
+        """
+        Args:
+            path: Optional JSON snapshot file; changes are appended to `<path>.log`
+            compact_every: Log entries written before folding them into the snapshot
+        """
+        self.path = path
+        self.log_path = f"{path}.log" if path else None
+        self.compact_every = compact_every
+        # Guards in-memory state and every write to the snapshot/log files
+        self._lock = threading.Lock()
+        self._docs: dict[str, dict] = {}
+        self._weights: dict[int, Counter] = {}
+        self._doc_counts: dict[int, Counter] = {}
+        self._forms: dict[str, Counter] = {}
+        self._cache: dict[tuple, dict] = {}
+        self._log_entries = 0
+        if path:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @staticmethod
+    def _terms(topic: str, description: str, tags: list[str]) -> tuple[Counter, list[tuple[str, str]]]:
+        weights: Counter = Counter()
+        forms = []
+        for token in tokenize(f"{topic} {description or ''}"):
+            key = stem(token)
+            weights[key] += 1.0
+            forms.append((key, token))
+        for tag in tags:
+            norm = normalize_tag(tag)
+            if not norm or norm in STOPWORDS:
+                continue
+            key = " ".join(stem(w) for w in norm.split())
+            weights[key] += TAG_WEIGHT
+            forms.append((key, norm))
+        return weights, forms
+
+    @staticmethod
+    def _bump(buckets: dict[int, Counter], day: int, key: str, delta: float) -> None:
+        bucket = buckets.setdefault(day, Counter())
+        bucket[key] += delta
+        if bucket[key] <= 0:
+            del bucket[key]
+        if not bucket:
+            del buckets[day]
+
+    def _apply(self, doc: dict, sign: int) -> None:
+        weights, forms = self._terms(doc["topic"], doc.get("description", ""), doc["tags"])
+        for key, weight in weights.items():
+            self._bump(self._weights, doc["day"], key, sign * weight)
+            self._bump(self._doc_counts, doc["day"], key, sign)
+        for key, form in forms:
+            surface = self._forms.setdefault(key, Counter())
+            surface[form] += sign
+            if surface[form] <= 0:
+                del surface[form]
+            if not surface:
+                del self._forms[key]
+
+    def _upsert_locked(self, doc_id, fields: dict) -> Optional[dict]:
+        """
+        Apply one upsert of 'topic', 'description', 'tags', 'created_at'; missing or
+        None fields keep their previous values. Returns the stored document if changed.
+        """
+        key = str(doc_id)
+        tags = fields.get("tags")
+        if isinstance(tags, str):
+            tags = [tags]
+        previous = self._docs.get(key) or {}
+        doc = {
+            "topic": fields.get("topic") if fields.get("topic") is not None else previous.get("topic", ""),
+            "description": (
+                fields.get("description") if fields.get("description") is not None
+                else previous.get("description", "")
+            ),
+            "tags": list(tags) if tags is not None else previous.get("tags", []),
+            "created_at": fields.get("created_at") or previous.get("created_at"),
+        }
+        if doc["created_at"] is None:
+            doc["created_at"] = datetime.now(timezone.utc).isoformat()
+        doc["day"] = _day(doc["created_at"])
+        if previous == doc:
+            return None
+        if previous:
+            self._apply(previous, -1)
+        self._apply(doc, +1)
+        self._docs[key] = doc
+        return doc
+
+    def _remove_locked(self, doc_id) -> bool:
+        previous = self._docs.pop(str(doc_id), None)
+        if previous is None:
+            return False
+        self._apply(previous, -1)
+        return True
+
+    def upsert(
+        self,
+        doc_id,
+        topic: Optional[str] = None,
+        tags: Optional[list[str]] = None,
+        created_at=None,
+        description: Optional[str] = None,
+    ) -> None:
+        """
+        Add or update one topic. Omitted fields keep their previously indexed values,
+        so tags from SummarizeTopic can be attached after the topic was ingested.
+        """
+        self.upsert_many([{
+            "id": doc_id, "topic": topic, "description": description, "tags": tags, "created_at": created_at,
+        }])
+
+    def upsert_many(self, docs: list[dict]) -> None:
+        """Upsert dicts with 'id', 'topic', and optionally 'description', 'tags', 'created_at'."""
+        with self._lock:
+            entries = []
+            for doc in docs:
+                stored = self._upsert_locked(doc["id"], doc)
+                if stored is not None:
+                    fields = {k: v for k, v in stored.items() if k != "day"}
+                    entries.append({"op": "upsert", "id": str(doc["id"]), "doc": fields})
+            if entries:
+                self._cache.clear()
+                self._append_log(entries)
+
+    def remove(self, doc_id) -> None:
+        with self._lock:
+            if self._remove_locked(doc_id):
+                self._cache.clear()
+                self._append_log([{"op": "remove", "id": str(doc_id)}])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._docs.clear()
+            self._weights.clear()
+            self._doc_counts.clear()
+            self._forms.clear()
+            self._cache.clear()
+            self._compact()
+
+    def top(self, limit: int = 50, window_days: Optional[int] = None, now: Optional[datetime] = None) -> dict:
+        """
+        Top weighted terms, optionally restricted to the last `window_days` days.
+
+        Returns:
+            Dict with 'terms' (list of 'term', 'weight' in [0, 1], and 'count',
+            the number of topics mentioning the term) and 'total_topics' in the window
+        """
+        today = _day(now or datetime.now(timezone.utc))
+        cache_key = (limit, window_days, today if window_days else None)
+        with self._lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            totals: Counter = Counter()
+            doc_counts: Counter = Counter()
+            for day, bucket in self._weights.items():
+                if window_days is None or today - day < window_days:
+                    totals.update(bucket)
+                    doc_counts.update(self._doc_counts[day])
+
+            total_topics = sum(
+                1 for doc in self._docs.values()
+                if window_days is None or today - doc["day"] < window_days
+            )
+            top = totals.most_common(limit)
+            peak = top[0][1] if top else 0
+            result = {
+                "terms": [
+                    {
+                        "term": self._forms[key].most_common(1)[0][0] if self._forms.get(key) else key,
+                        "weight": round(weight / peak, 4),
+                        "count": int(doc_counts[key]),
+                    }
+                    for key, weight in top
+                ],
+                "total_topics": total_topics,
+            }
+            self._cache[cache_key] = result
+            return result
+
+    def compact(self) -> None:
+        """Fold the change log into a fresh snapshot."""
+        with self._lock:
+            self._compact()
+
+    def _append_log(self, entries: list[dict]) -> None:
+        if not self.path:
+            return
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(entry) + "\n" for entry in entries))
+        self._log_entries += len(entries)
+        if self._log_entries >= self.compact_every:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Atomically write a snapshot, then truncate the log. Caller holds the lock."""
+        if not self.path:
+            return
+        payload = {key: {k: v for k, v in doc.items() if k != "day"} for key, doc in self._docs.items()}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with tempfile.NamedTemporaryFile(
+            "w", dir=directory, suffix=".tmp", delete=False, encoding="utf-8"
+        ) as f:
+            json.dump(payload, f)
+        try:
+            os.replace(f.name, self.path)
+        except OSError:
+            os.unlink(f.name)
+            raise
+        # Replaying upserts is idempotent, so a crash before this truncate is harmless
+        open(self.log_path, "w").close()
+        self._log_entries = 0
+
+    def _load(self) -> None:
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                payload = json.load(f)
+            for key, doc in payload.items():
+                self._upsert_locked(key, doc)
+        if os.path.exists(self.log_path):
+            with open(self.log_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn final write from a crash
+                        continue
+                    if entry.get("op") == "remove":
+                        self._remove_locked(entry["id"])
+                    else:
+                        self._upsert_locked(entry["id"], entry.get("doc", {}))
+                    self._log_entries += 1
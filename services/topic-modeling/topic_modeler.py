@@ -4,9 +4,14 @@ Uses Ollama as the LLM backend.
 """
 
 import dspy
+import logging
 from typing import Optional
 import os
 
+from priority_scorer import ScoringWeights, cluster_sizes_from_themes, rank_topics, submission_counts
+
+logger = logging.getLogger("topic-modeling")
+
 
 def configure_ollama(model: str = "llama3.2", base_url: Optional[str] = None):
     """Configure DSPy to use Ollama."""
@@ -50,6 +55,17 @@ class PrioritizeTopics(dspy.Signature):
     )
 
 
+class ExplainPriorities(dspy.Signature):
+    """Explain why each of these already-ranked topics deserves its priority score."""
+    
+    topics: list[dict] = dspy.InputField(
+        desc="Top-ranked topics with 'text', 'description', 'priority', 'submission_count', and 'score'"
+    )
+    reasoning: list[str] = dspy.OutputField(
+        desc="One short sentence of reasoning per topic, in the same order as the input"
+    )
+
+
 class GenerateAgenda(dspy.Signature):
     """Generate a meeting agenda based on submitted topics."""
     
@@ -67,11 +83,74 @@ class GenerateAgenda(dspy.Signature):
 class TopicAnalyzer(dspy.Module):
     """Comprehensive topic analysis combining multiple capabilities."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        weights: Optional[ScoringWeights] = None,
+        reasoning_top_k: int = 10,
+        prioritization_mode: str = "hybrid",
+    ):
+        """
+        Args:
+            weights: Signal weights for local scoring
+            reasoning_top_k: How many top-ranked topics get LLM reasoning
+            prioritization_mode: 'local' (scores only), 'hybrid' (local scores,
+                LLM reasoning for the top-K), or 'llm' (legacy PrioritizeTopics)
+        """
         super().__init__()
+        self.weights = weights or ScoringWeights()
+        self.reasoning_top_k = reasoning_top_k
+        self.prioritization_mode = prioritization_mode
         self.extract_themes = dspy.ChainOfThought(ExtractThemes)
         self.summarize = dspy.ChainOfThought(SummarizeTopic)
         self.prioritize = dspy.ChainOfThought(PrioritizeTopics)
+        self.explain = dspy.ChainOfThought(ExplainPriorities)
+    
+    def prioritize_topics(self, topics: list[dict], themes: Optional[list[dict]] = None) -> list[dict]:
+        """
+        Rank topics locally and, in hybrid mode, ask the LLM to explain the top-K.
+        
+        Args:
+            topics: List of dicts with 'topic', 'description', 'priority', and
+                optionally 'submission_count', 'created_at', 'cluster_size'.
+                Without 'submission_count', duplicates of the same normalized
+                text in the batch are counted.
+            themes: ExtractThemes output used to derive cluster sizes (the larger
+                of this and a supplied 'cluster_size' wins)
+        
+        Returns:
+            Topics ordered by priority with 'topic_index', 'score', and 'reasoning'
+        """
+        counts = submission_counts(topics)
+        topics_for_priority = [
+            {
+                "text": t["topic"],
+                "description": t.get("description", ""),
+                "priority": t.get("priority", "medium"),
+                "submission_count": int(count),
+            }
+            for t, count in zip(topics, counts)
+        ]
+        if self.prioritization_mode == "llm":
+            return self.prioritize(topics=topics_for_priority).prioritized
+        
+        cluster_sizes = cluster_sizes_from_themes(themes, len(topics)) if themes is not None else None
+        ranked = rank_topics(topics, weights=self.weights, cluster_sizes=cluster_sizes)
+        for item in ranked:
+            item["reasoning"] = None
+        
+        top = ranked[:max(self.reasoning_top_k, 0)]
+        if self.prioritization_mode == "hybrid" and top:
+            # The local ranking stands on its own; reasoning is best-effort
+            try:
+                explained = self.explain(topics=[
+                    {**topics_for_priority[item["topic_index"]], "score": item["score"]}
+                    for item in top
+                ])
+                for item, reasoning in zip(top, explained.reasoning or []):
+                    item["reasoning"] = reasoning
+            except Exception:
+                logger.exception("Priority reasoning failed; returning scores without reasoning")
+        return ranked
     
     def analyze_topics(self, topics: list[dict]) -> dict:
         """
@@ -103,21 +182,12 @@ class TopicAnalyzer(dspy.Module):
             })
         
         # Prioritize
-        topics_for_priority = [
-            {
-                "text": t["topic"],
-                "description": t.get("description", ""),
-                "priority": t.get("priority", "medium"),
-                "submission_count": 1  # Could be aggregated in real implementation
-            }
-            for t in topics
-        ]
-        priority_result = self.prioritize(topics=topics_for_priority)
+        prioritization = self.prioritize_topics(topics, themes=themes_result.themes)
         
         return {
             "themes": themes_result.themes,
             "summaries": summaries,
-            "prioritization": priority_result.prioritized
+            "prioritization": prioritization
         }
 
 